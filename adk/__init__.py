@@ -2,5 +2,24 @@
 
 from .agent import Agent
 from .agent_configuration import AgentConfiguration, agent_configuration
+from .history import History, PayloadStore
+from .request_scheduler import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    RequestScheduler,
+    RetryPolicy,
+)
 
-__all__ = ["Agent", "AgentConfiguration", "agent_configuration"]
+__all__ = [
+    "Agent",
+    "AgentConfiguration",
+    "agent_configuration",
+    "History",
+    "PayloadStore",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "DeadlineExceededError",
+    "RequestScheduler",
+    "RetryPolicy",
+]
@@ -1,6 +1,14 @@
+import math
+import time
+
 from google import genai
 from google.genai import types
 from .agent_configuration import agent_configuration
+from .history import History
+from .request_scheduler import DeadlineExceededError, RequestScheduler
+
+# Maximum number of tool rounds in a single turn, as in automatic function calling
+MAX_TOOL_ROUNDS = 10
 
 
 class Agent:
@@ -9,6 +17,8 @@ class Agent:
         model: str = None,
         tools: list = None,
         system_instruction: str = "You are a helpful assistant.",
+        scheduler: RequestScheduler = None,
+        history: History = None,
     ):
         """Initialize a conversational agent with Google GenAI.
 
@@ -17,6 +27,11 @@ class Agent:
                    If not provided, uses the model from agent_configuration.
             tools: List of Python functions to use as tools
             system_instruction: System prompt that defines agent behavior
+            scheduler: Request scheduler applying retries, deadlines, hedging
+                       and circuit breaking to model calls. Defaults to a
+                       RequestScheduler with the default retry policy.
+            history: Conversation history to continue. Defaults to an empty
+                     History backed by the shared payload store.
 
         Examples:
             Basic initialization:
@@ -42,27 +57,38 @@ class Agent:
             ...     tools=[read_file],
             ...     system_instruction="You are a helpful Coding Assistant."
             ... )
+
+            With a per-turn deadline and hedged requests:
+
+            >>> agent = Agent(
+            ...     scheduler=RequestScheduler(deadline=30.0, hedge_delay=2.0),
+            ... )
         """
         self.model = model or agent_configuration.model
         self.client = genai.Client(api_key=agent_configuration.api_key)
-        self.contents = []
+        self.history = history if history is not None else History()
         self.tools = tools or []
         self.system_instruction = system_instruction
+        self.scheduler = scheduler or RequestScheduler()
 
     def run(self, contents: str | list[dict[str, str]]):
         """Execute a conversational turn with the agent.
 
         This method sends a message to the agent and returns the response.
         It automatically maintains the conversation history and handles function calls
-        by recursively calling itself when the model requests tool execution.
+        by running the requested tools and sending their results back to the model.
 
         The function calling flow:
         1. User message is sent with available tool declarations
         2. Model responds with text and/or function calls
-        3. If function calls exist, they are executed locally
-        4. Function results are sent back to the model (recursive call)
+        3. If function calls exist, they are executed locally, exactly once
+        4. Function results are sent back to the model (a new scheduled request)
         5. Model generates a final natural language response
 
+        Only the model requests go through the scheduler, so retries and
+        hedges never run a tool twice. The scheduler's deadline covers the
+        whole turn, tool runs included.
+
         Args:
             contents: Either a string message or a list of part dictionaries
                      for continuing a conversation with function responses
@@ -70,6 +96,12 @@ class Agent:
         Returns:
             The model's response object containing the generated content
 
+        Raises:
+            DeadlineExceededError: If the turn does not complete before the
+                                   scheduler's deadline. A tool that is already
+                                   running is not interrupted.
+            CircuitOpenError: If the scheduler's circuit breaker is open.
+
         Examples:
             Basic query with automatic function calling:
 
@@ -95,21 +127,125 @@ class Agent:
         """
         if isinstance(contents, list):
             # Append a part to an existing conversation
-            self.contents.append({"role": "user", "parts": contents})
+            parts = contents
         else:
             # Start a new conversation
-            self.contents.append({"role": "user", "parts": [{"text": contents}]})
+            parts = [{"text": contents}]
+        turn_start = len(self.history)
+        self.history.append("user", parts)
 
-        # Configure the client and tools
+        # Configure the client and tools. Tools run here rather than inside
+        # generate_content, so a retried, hedged or abandoned request can
+        # never run them a second time
         config = types.GenerateContentConfig(
             system_instruction=self.system_instruction,
             tools=self.tools,
+            automatic_function_calling=types.AutomaticFunctionCallingConfig(
+                disable=True
+            ),
         )
+        deadline = self.scheduler.deadline
+        deadline_at = time.monotonic() + deadline if deadline is not None else None
+
+        try:
+            tool_rounds = 0
+            while True:
+                response = self._send(config, deadline_at)
+
+                candidate = response.candidates[0] if response.candidates else None
+                if candidate is None or candidate.content is None:
+                    # No model turn to record (e.g. blocked for safety); drop
+                    # the unanswered turn so the history stays consistent
+                    self._rollback(turn_start)
+                    return response
+                self.history.append_content(candidate.content)
+
+                if not response.function_calls or tool_rounds == MAX_TOOL_ROUNDS:
+                    return response
+                self.history.append("user", self._call_tools(response.function_calls))
+                tool_rounds += 1
+        except Exception:
+            # Drop the unanswered turn so the conversation can be retried
+            self._rollback(turn_start)
+            raise
+
+    def _send(self, config: types.GenerateContentConfig, deadline_at: float | None):
+        remaining = None
+        if deadline_at is not None:
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                raise DeadlineExceededError("Deadline exceeded while running tools")
+
+        # Snapshot the history: hedged and abandoned attempts run in worker
+        # threads and must not see turns appended or popped by run()
+        request_contents = self.history.to_contents()
+
+        def send(timeout: float | None):
+            attempt_config = config
+            if timeout is not None:
+                # Let the SDK abort the call at the deadline instead of
+                # leaving it running in a scheduler worker thread
+                http_options = types.HttpOptions(
+                    timeout=max(1, math.ceil(timeout * 1000))
+                )
+                attempt_config = config.model_copy(
+                    update={"http_options": http_options}
+                )
+            return self.client.models.generate_content(
+                model=self.model, contents=request_contents, config=attempt_config
+            )
+
+        return self.scheduler.execute(send, deadline=remaining)
+
+    def _call_tools(self, function_calls: list[types.FunctionCall]) -> list[dict]:
+        tools = {getattr(tool, "__name__", None): tool for tool in self.tools}
+        parts = []
+        for function_call in function_calls:
+            try:
+                tool = tools.get(function_call.name)
+                if not callable(tool):
+                    raise ValueError(f"Unknown tool: {function_call.name}")
+                response = {"result": tool(**(function_call.args or {}))}
+            except Exception as error:
+                # Report tool errors to the model, as automatic function calling does
+                response = {"error": str(error)}
+            parts.append(
+                {
+                    "function_response": {
+                        "id": function_call.id,
+                        "name": function_call.name,
+                        "response": response,
+                    }
+                }
+            )
+        return parts
+
+    def _rollback(self, length: int):
+        while len(self.history) > length:
+            self.history.pop()
+
+    @property
+    def contents(self) -> list[types.Content]:
+        """A snapshot of the conversation history as SDK Content objects.
+
+        The history is stored compactly in `self.history`; this builds a new
+        list on every access, so changes to the returned list are not kept.
+        Use `self.history` to append turns, or assign a list to replace the
+        whole history.
+        """
+        return self.history.to_contents()
 
-        # Send request with function declarations
-        response = self.client.models.generate_content(
-            model=self.model, contents=self.contents, config=config
-        )
-        self.contents.append(response.candidates[0].content)
+    @contents.setter
+    def contents(self, contents: list[dict | types.Content]):
+        """Replaces the history with the given turns.
 
-        return response
+        Args:
+            contents: Content objects or {"role": ..., "parts": [...]} dictionaries.
+        """
+        history = History(payload_store=self.history.payload_store)
+        for content in contents:
+            if isinstance(content, dict):
+                history.append(content["role"], content["parts"])
+            else:
+                history.append_content(content)
+        self.history = history
@@ -0,0 +1,191 @@
+"""Compact in-memory conversation history."""
+
+import hashlib
+import json
+import sys
+import threading
+import weakref
+
+from google.genai import types
+
+
+class Turn:
+    """A single conversation turn.
+
+    Parts are stored as plain strings for text-only parts and as JSON bytes
+    for everything else (function calls, function responses, thought
+    signatures, ...). Large JSON payloads are shared through a PayloadStore.
+
+    Attributes:
+        role: Either "user" or "model".
+        parts: Tuple of str, bytes or Payload objects.
+    """
+
+    __slots__ = ("parts", "role")
+
+    def __init__(self, role: str, parts: tuple):
+        self.role = role
+        self.parts = parts
+
+    def to_content(self) -> types.Content:
+        """Converts the turn to an SDK Content object."""
+        return types.Content(role=self.role, parts=[_to_part(p) for p in self.parts])
+
+
+class Payload:
+    """An interned JSON payload shared by every turn that contains it."""
+
+    __slots__ = ("__weakref__", "data")
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+class PayloadStore:
+    """Deduplicates large JSON payloads across turns and sessions.
+
+    Payloads are held weakly: once no turn references a payload it is
+    released, so a long-lived shared store does not grow without bound.
+
+    Attributes:
+        min_size: Payloads smaller than this many bytes are not interned.
+    """
+
+    def __init__(self, min_size: int = 256):
+        """Initialize an empty payload store.
+
+        Args:
+            min_size: Minimum payload size, in bytes, worth deduplicating.
+        """
+        self.min_size = min_size
+        self._payloads = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def intern(self, data: bytes) -> bytes | Payload:
+        """Returns a shared Payload for large data, or the data itself.
+
+        Args:
+            data: JSON-encoded part.
+        """
+        if len(data) < self.min_size:
+            return data
+
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        with self._lock:
+            payload = self._payloads.get(digest)
+            if payload is None:
+                payload = Payload(data)
+                self._payloads[digest] = payload
+            elif payload.data != data:
+                # Digest collision: keep the data unshared rather than swap it
+                return Payload(data)
+            return payload
+
+
+# Create a shared store so identical tool payloads are stored once per process
+shared_payload_store = PayloadStore()
+
+
+class History:
+    """Conversation history stored compactly and converted to SDK types on demand.
+
+    Keeping thousands of sessions as SDK Content objects is expensive, since
+    each one is a tree of pydantic models. History keeps each turn as a
+    slotted Turn with str or bytes parts and only builds Content objects
+    when a request is sent.
+
+    Examples:
+        >>> history = History()
+        >>> history.append("user", [{"text": "What files are here?"}])
+        >>> history.append_content(response.candidates[0].content)
+        >>> client.models.generate_content(
+        ...     model=model, contents=history.to_contents(), config=config
+        ... )
+        >>> history.memory_usage()
+        1184
+    """
+
+    def __init__(self, payload_store: PayloadStore = None):
+        """Initialize an empty history.
+
+        Args:
+            payload_store: Store used to deduplicate large payloads.
+                           Defaults to the process-wide shared store.
+        """
+        self.payload_store = (
+            payload_store if payload_store is not None else shared_payload_store
+        )
+        self._turns = []
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def __iter__(self):
+        return iter(self._turns)
+
+    def append(self, role: str, parts: list[dict | types.Part]):
+        """Appends a turn built from part dictionaries or SDK Part objects.
+
+        Args:
+            role: Either "user" or "model".
+            parts: Parts of the turn, e.g. [{"text": "Hello"}].
+        """
+        self._turns.append(Turn(role, tuple(self._compact(part) for part in parts)))
+
+    def append_content(self, content: types.Content):
+        """Appends a turn from an SDK Content object.
+
+        Args:
+            content: Content returned by the model.
+        """
+        self.append(content.role or "model", content.parts or [])
+
+    def pop(self) -> Turn:
+        """Removes and returns the last turn."""
+        return self._turns.pop()
+
+    def to_contents(self) -> list[types.Content]:
+        """Builds the SDK Content objects for a request."""
+        return [turn.to_content() for turn in self._turns]
+
+    def memory_usage(self) -> int:
+        """Returns the approximate number of bytes used by this history.
+
+        Shared payloads are counted once per history that references them,
+        so summing across sessions overestimates the process total.
+        """
+        seen = set()
+        size = sys.getsizeof(self._turns)
+        for turn in self._turns:
+            size += sys.getsizeof(turn) + sys.getsizeof(turn.parts)
+            for part in turn.parts:
+                if id(part) in seen:
+                    continue
+                seen.add(id(part))
+                size += sys.getsizeof(part)
+                if isinstance(part, Payload):
+                    size += sys.getsizeof(part.data)
+        return size
+
+    def _compact(self, part: dict | types.Part) -> str | bytes | Payload:
+        if isinstance(part, dict):
+            if part.keys() == {"text"}:
+                return part["text"]
+            part = types.Part.model_validate(part)
+
+        fields = part.model_dump(mode="json", exclude_none=True)
+        if fields.keys() == {"text"}:
+            return fields["text"]
+        data = json.dumps(fields, separators=(",", ":")).encode()
+        return self.payload_store.intern(data)
+
+
+def _to_part(part: str | bytes | Payload) -> types.Part:
+    if isinstance(part, str):
+        return types.Part(text=part)
+    if isinstance(part, Payload):
+        part = part.data
+    return types.Part.model_validate_json(part)
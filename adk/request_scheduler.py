@@ -0,0 +1,417 @@
+"""Resilient execution of model requests: retries, hedging, deadlines and circuit breaking."""
+
+import math
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import TypeVar
+
+import httpx
+from google.genai import errors
+
+T = TypeVar("T")
+
+# HTTP status codes that indicate a transient failure worth retrying
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a request does not complete before its deadline."""
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a request is rejected because the circuit breaker is open."""
+
+
+class _QueueExpiredError(DeadlineExceededError):
+    """Raised when the deadline passes before an attempt reaches a worker.
+
+    The backend was never called, so the circuit breaker records nothing.
+    """
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for transient request failures.
+
+    Attributes:
+        max_attempts: Maximum number of attempts, including the first one.
+        initial_backoff: Upper bound of the delay before the first retry, in seconds.
+        max_backoff: Upper bound of any single delay, in seconds.
+        multiplier: Factor by which the backoff bound grows after each attempt.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        initial_backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        multiplier: float = 2.0,
+    ):
+        """Initialize the retry policy.
+
+        Args:
+            max_attempts: Maximum number of attempts, including the first one.
+            initial_backoff: Upper bound of the first retry delay, in seconds.
+            max_backoff: Upper bound of any single retry delay, in seconds.
+            multiplier: Growth factor of the backoff bound between attempts.
+
+        Raises:
+            ValueError: If max_attempts is lower than 1.
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.multiplier = multiplier
+
+    def backoff(self, attempt: int) -> float:
+        """Returns the delay to wait before retrying after the given attempt.
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed.
+        """
+        bound = min(self.max_backoff, self.initial_backoff * self.multiplier**attempt)
+        return random.uniform(0, bound)  # nosec B311 - jitter, not cryptography
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """Returns whether the error is transient and the request may be retried.
+
+        Args:
+            error: The exception raised by the failed attempt.
+        """
+        if isinstance(error, errors.APIError):
+            return error.code in RETRYABLE_STATUS_CODES
+        if isinstance(error, DeadlineExceededError):
+            return False
+        return isinstance(error, (httpx.TransportError, ConnectionError, TimeoutError))
+
+
+class CircuitBreaker:
+    """Client-side circuit breaker that stops calling a failing backend.
+
+    The breaker starts closed. After `failure_threshold` consecutive failures it
+    opens and rejects every request with CircuitOpenError. Once `reset_timeout`
+    seconds have passed it becomes half-open and lets a single probe request
+    through: a success closes the circuit, a failure opens it again.
+
+    Attributes:
+        failure_threshold: Consecutive failures needed to open the circuit.
+        reset_timeout: Seconds to wait in the open state before probing.
+        state: One of "closed", "open" or "half_open".
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a closed circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures needed to open the circuit.
+            reset_timeout: Seconds to wait in the open state before probing.
+            clock: Monotonic time source, overridable for testing.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """Checks whether a request may be sent.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a probe
+                              already in flight.
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    raise CircuitOpenError("Circuit breaker is open")
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    raise CircuitOpenError("Circuit breaker is half-open")
+                self._probe_in_flight = True
+
+    def release(self):
+        """Frees the half-open probe slot without recording an outcome."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self):
+        """Records a successful request and closes the circuit."""
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """Records a failed request, opening the circuit if needed."""
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = self._clock()
+                self._probe_in_flight = False
+
+
+class RequestScheduler:
+    """Executes requests with deadlines, retries, hedging and circuit breaking.
+
+    Hedging sends a duplicate of a slow request and returns whichever copy
+    finishes first. The duplicate is sent once the original has been running
+    longer than the `hedge_percentile` of recently observed latencies, or
+    `hedge_delay` seconds while fewer than `min_hedge_samples` are known.
+
+    Each attempt, including a hedge, must pass the circuit breaker's
+    `before_request` check, so a half-open breaker lets only one probe
+    through. An attempt and its hedge record a single outcome. Attempts that
+    time out while still queued for a worker never reached the backend and
+    record no outcome.
+
+    Every request is called with the seconds left before the deadline (or
+    None), so it can pass that budget down as a transport timeout and abort
+    instead of holding a worker thread after the deadline. A request that
+    ignores it cannot be interrupted: abandoned attempts (lost hedges or
+    attempts past the deadline) keep running until they return.
+
+    Attributes:
+        retry_policy: Backoff and retry classification for failed attempts.
+        deadline: Default deadline for a whole request, in seconds, or None.
+        hedge_delay: Initial hedging delay in seconds, or None to disable hedging.
+        hedge_percentile: Latency percentile after which a hedge is sent.
+        attempt_timeout: Maximum seconds given to a single attempt, or None.
+        circuit_breaker: Optional breaker guarding every attempt.
+    """
+
+    def __init__(
+        self,
+        retry_policy: RetryPolicy = None,
+        deadline: float | None = None,
+        hedge_delay: float | None = None,
+        hedge_percentile: float = 0.95,
+        min_hedge_samples: int = 20,
+        attempt_timeout: float | None = None,
+        circuit_breaker: CircuitBreaker = None,
+        max_workers: int = 8,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            retry_policy: Retry policy. Defaults to RetryPolicy().
+            deadline: Default deadline for a whole request, in seconds.
+            hedge_delay: Delay before hedging until enough latencies are known.
+                         None disables hedging.
+            hedge_percentile: Latency percentile after which a hedge is sent.
+            min_hedge_samples: Latencies needed before the percentile is used.
+            attempt_timeout: Maximum seconds given to a single attempt. Passed
+                             to the request as its timeout when shorter than
+                             the time left before the deadline.
+            circuit_breaker: Optional circuit breaker.
+            max_workers: Maximum number of concurrent attempts.
+            sleep: Sleep function used between retries, overridable for testing.
+
+        Raises:
+            ValueError: If hedging is enabled without a deadline or an
+                        attempt_timeout, since lost hedges could then hold
+                        worker threads forever.
+
+        Examples:
+            >>> scheduler = RequestScheduler(
+            ...     retry_policy=RetryPolicy(max_attempts=5),
+            ...     deadline=30.0,
+            ...     hedge_delay=2.0,
+            ...     circuit_breaker=CircuitBreaker(),
+            ... )
+            >>> response = scheduler.execute(
+            ...     lambda timeout: client.models.generate_content(
+            ...         model=model,
+            ...         contents=contents,
+            ...         config=types.GenerateContentConfig(
+            ...             http_options=types.HttpOptions(timeout=int(timeout * 1000))
+            ...         ),
+            ...     )
+            ... )
+        """
+        if hedge_delay is not None and deadline is None and attempt_timeout is None:
+            raise ValueError("Hedging requires a deadline or an attempt_timeout")
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.deadline = deadline
+        self.hedge_delay = hedge_delay
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_samples = min_hedge_samples
+        self.attempt_timeout = attempt_timeout
+        self.circuit_breaker = circuit_breaker
+        self._latencies = deque(maxlen=1000)
+        self._max_workers = max_workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._sleep = sleep
+
+    def execute(
+        self, request: Callable[[float | None], T], deadline: float | None = None
+    ) -> T:
+        """Runs the request until it succeeds, fails permanently or times out.
+
+        Args:
+            request: Callable performing a single attempt. It receives the
+                     seconds left before the deadline, or None when there
+                     is no deadline.
+            deadline: Deadline for this request in seconds. Overrides the
+                      scheduler's default deadline.
+
+        Returns:
+            The value returned by the first successful attempt.
+
+        Raises:
+            DeadlineExceededError: If the deadline passes before a success.
+            CircuitOpenError: If the circuit breaker rejects an attempt.
+            Exception: The last attempt's error when it is not retryable or
+                       the retry budget is exhausted.
+        """
+        deadline = deadline if deadline is not None else self.deadline
+        deadline_at = time.monotonic() + deadline if deadline is not None else None
+        for attempt_index in range(self.retry_policy.max_attempts):
+            if self.circuit_breaker:
+                self.circuit_breaker.before_request()
+            try:
+                result = self._attempt(request, deadline_at)
+            except Exception as error:
+                retryable = self.retry_policy.is_retryable(error)
+                if self.circuit_breaker:
+                    if isinstance(error, _QueueExpiredError):
+                        self.circuit_breaker.release()
+                    elif retryable or isinstance(error, DeadlineExceededError):
+                        self.circuit_breaker.record_failure()
+                    else:
+                        # The backend answered; the request itself was bad
+                        self.circuit_breaker.record_success()
+                if not retryable or attempt_index + 1 == self.retry_policy.max_attempts:
+                    raise
+                delay = self.retry_policy.backoff(attempt_index)
+                if deadline_at is not None and time.monotonic() + delay >= deadline_at:
+                    raise DeadlineExceededError(
+                        f"Deadline of {deadline}s exceeded while retrying"
+                    ) from error
+                self._sleep(delay)
+            else:
+                if self.circuit_breaker:
+                    self.circuit_breaker.record_success()
+                return result
+
+    def current_hedge_delay(self) -> float | None:
+        """Returns the delay after which a hedge is sent, or None if disabled."""
+        if self.hedge_delay is None:
+            return None
+        samples = sorted(self._latencies)
+        if len(samples) < self.min_hedge_samples:
+            return self.hedge_delay
+        index = max(0, math.ceil(self.hedge_percentile * len(samples)) - 1)
+        return samples[index]
+
+    def shutdown(self):
+        """Releases the worker threads without waiting for abandoned attempts."""
+        with self._executor_lock:
+            if self._executor:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _attempt(
+        self, request: Callable[[float | None], T], deadline_at: float | None
+    ) -> T:
+        hedge_delay = self.current_hedge_delay()
+        if deadline_at is None and hedge_delay is None:
+            # Nothing to time out or race: run inline and skip the thread hop
+            return self._timed(request, deadline_at)
+
+        executor = self._get_executor()
+        pending = {executor.submit(self._timed, request, deadline_at)}
+        if hedge_delay is not None:
+            done, _ = wait(pending, timeout=_bounded(hedge_delay, deadline_at))
+            if not done and not _expired(deadline_at) and self._admit_hedge():
+                pending.add(executor.submit(self._timed, request, deadline_at))
+
+        error = None
+        while pending:
+            done, pending = wait(
+                pending, timeout=_remaining(deadline_at), return_when=FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    return future.result()
+                error = future.exception()
+
+        if pending:
+            # cancel() only succeeds for attempts still waiting for a worker
+            started = [future for future in pending if not future.cancel()]
+            if not started and error is None:
+                raise _QueueExpiredError("Deadline exceeded waiting for a worker")
+            raise DeadlineExceededError("Deadline exceeded waiting for a response")
+        raise error
+
+    def _admit_hedge(self) -> bool:
+        if not self.circuit_breaker:
+            return True
+        try:
+            self.circuit_breaker.before_request()
+        except CircuitOpenError:
+            return False
+        return True
+
+    def _timed(
+        self, request: Callable[[float | None], T], deadline_at: float | None
+    ) -> T:
+        # Computed here rather than at submit time, in case the attempt queued
+        timeout = _remaining(deadline_at)
+        if timeout == 0:
+            raise _QueueExpiredError("Deadline exceeded before the attempt started")
+        if self.attempt_timeout is not None:
+            timeout = min(timeout or self.attempt_timeout, self.attempt_timeout)
+        started = time.monotonic()
+        result = request(timeout)
+        self._latencies.append(time.monotonic() - started)
+        return result
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="adk-request",
+                )
+            return self._executor
+
+
+def _remaining(deadline_at: float | None) -> float | None:
+    if deadline_at is None:
+        return None
+    return max(0.0, deadline_at - time.monotonic())
+
+
+def _bounded(timeout: float, deadline_at: float | None) -> float:
+    remaining = _remaining(deadline_at)
+    return timeout if remaining is None else min(timeout, remaining)
+
+
+def _expired(deadline_at: float | None) -> bool:
+    return deadline_at is not None and time.monotonic() >= deadline_at
@@ -12,7 +12,7 @@ if env_path.exists():
     load_dotenv(env_path)
 
 from adk import Agent  # noqa: E402
-from tools import file_tools  # noqa: E402
+from tools import Workspace, bind_file_tools, file_tools  # noqa: E402
 
 
 class FileAgent(Agent):
@@ -20,21 +20,39 @@ class FileAgent(Agent):
 
     This agent inherits from the base Agent class and is pre-configured
     with file system tools and appropriate instructions.
+
+    When bound to a Workspace, its tools can only access files inside the
+    workspace roots, so agents for many tenants can share one process.
     """
 
-    def __init__(self, model: str = None):
+    def __init__(self, model: str = None, workspace: Workspace = None):
         """Initialize the file agent.
 
         Args:
             model: Optional model identifier. If not provided, uses default from config.
+            workspace: Optional workspace confining the file tools. If not provided,
+                       the tools access paths relative to the current directory.
+
+        Examples:
+            >>> agent = FileAgent(workspace=Workspace("/srv/tenants/acme"))
         """
         system_instruction = """You are a helpful file management assistant.
 You have access to tools for reading, writing, and listing files.
 Always be careful when writing files - make sure you understand the context first.
 When asked to work with files, use the appropriate tools."""
 
+        tools = file_tools
+        if workspace:
+            tools = bind_file_tools(workspace)
+            roots = "\n".join(f"- {root}" for root in workspace.roots)
+            system_instruction += f"""
+You can only access files inside these workspace directories:
+{roots}
+Relative paths are resolved against the first one."""
+
+        self.workspace = workspace
         super().__init__(
             model=model,
-            tools=file_tools,
+            tools=tools,
             system_instruction=system_instruction,
         )
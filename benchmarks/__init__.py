@@ -0,0 +1 @@
+"""Benchmarks - Performance measurements for agents and tools."""
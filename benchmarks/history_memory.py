@@ -0,0 +1,123 @@
+"""Benchmark of conversation history memory across many sessions.
+
+Builds the same conversations twice: as the plain dicts and SDK Content
+objects Agent used to keep, and as compact History objects. Every session
+reads the same large file, as agents sharing a workspace often do.
+
+Importing adk loads its configuration, so GEMINI_API_KEY must be set
+(any value works, no requests are sent).
+
+Usage:
+    uv run python -m benchmarks.history_memory
+    uv run python -m benchmarks.history_memory --sessions 1000 --turns 20
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+
+from google.genai import types
+
+from adk import History
+
+FILE_CONTENTS = "# hello-genai\n\n" + "A scalable multi-agent architecture. " * 60
+
+
+def wire_turns(session: int, turns: int):
+    """Yields (role, parts) pairs as freshly decoded from the API.
+
+    Args:
+        session: Session index, used to make text unique per session.
+        turns: Number of turns to generate.
+    """
+    for turn in range(turns):
+        step = turn % 4
+        if step == 0:
+            parts = [{"text": f"Session {session}, question {turn}: summarise it."}]
+        elif step == 1:
+            parts = [
+                {
+                    "function_call": {
+                        "name": "read_file",
+                        "args": {"file_path": "README.md"},
+                    },
+                    "thought_signature": "c2lnbmF0dXJl" * 8,
+                }
+            ]
+        elif step == 2:
+            parts = [
+                {
+                    "function_response": {
+                        "name": "read_file",
+                        "response": {"result": FILE_CONTENTS},
+                    }
+                }
+            ]
+        else:
+            parts = [{"text": f"Session {session}, answer {turn}: it is a demo."}]
+        # Round-trip through JSON so no strings are shared between sessions
+        yield ("user" if step in (0, 2) else "model"), json.loads(json.dumps(parts))
+
+
+def build_sdk_sessions(sessions: int, turns: int) -> list:
+    """Builds histories the way Agent stored them: dicts and Content objects."""
+    histories = []
+    for session in range(sessions):
+        contents = []
+        for role, parts in wire_turns(session, turns):
+            if role == "user":
+                contents.append({"role": role, "parts": parts})
+            else:
+                contents.append(types.Content(role=role, parts=parts))
+        histories.append(contents)
+    return histories
+
+
+def build_compact_sessions(sessions: int, turns: int) -> list:
+    """Builds the same histories as compact History objects."""
+    histories = []
+    for session in range(sessions):
+        history = History()
+        for role, parts in wire_turns(session, turns):
+            if role == "user":
+                history.append(role, parts)
+            else:
+                history.append_content(types.Content(role=role, parts=parts))
+        histories.append(history)
+    return histories
+
+
+def measure(label: str, build, sessions: int, turns: int) -> list:
+    """Prints the memory retained by the histories returned by build."""
+    gc.collect()
+    tracemalloc.start()
+    histories = build(sessions, turns)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_session = retained / sessions / 1024
+    print(f"{label:<24} {retained / 1024**2:10.1f} MiB {per_session:10.1f} KiB/session")
+    return histories
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--turns", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"History memory ({args.sessions:,} sessions x {args.turns} turns)")
+    print("-" * 60)
+    measure("SDK dicts and Content", build_sdk_sessions, args.sessions, args.turns)
+    histories = measure(
+        "Compact History", build_compact_sessions, args.sessions, args.turns
+    )
+
+    reported = sum(history.memory_usage() for history in histories) / len(histories)
+    print(f"History.memory_usage()   {reported / 1024:21.1f} KiB/session")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark of path-resolution overhead per file tool call.
+
+Compares the unconfined tools (tilde expansion only) with Workspace
+resolution, with and without the lexical resolution cache, and with the
+symlink-safe walk from the root that every file access performs.
+
+Usage:
+    uv run python -m benchmarks.workspace_resolution
+"""
+
+import os
+import tempfile
+import timeit
+
+from tools import Workspace
+
+ITERATIONS = 100_000
+PATHS = [
+    "README.md",
+    "src/package/module.py",
+    "src/package/subpackage/deeply/nested/file.txt",
+    "docs/../src/package/module.py",
+]
+
+
+def measure(label: str, resolve, paths: list[str]):
+    """Prints the mean time per resolution of the given paths.
+
+    Args:
+        label: Name of the strategy being measured.
+        resolve: Function resolving a single path.
+        paths: Paths to resolve in a round-robin fashion.
+    """
+
+    def resolve_all():
+        for path in paths:
+            resolve(path)
+
+    resolve_all()  # Warm up caches
+    seconds = min(timeit.repeat(resolve_all, number=ITERATIONS // len(paths), repeat=5))
+    per_call = seconds / ITERATIONS * 1_000_000
+    print(f"{label:<32} {per_call:8.2f} µs/call")
+
+
+def walk(workspace: Workspace, path: str):
+    """Opens and closes a path the way Workspace.open and listdir reach it."""
+    os.close(workspace._open(path, os.O_RDONLY))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        os.makedirs(os.path.join(root, "src/package/subpackage/deeply/nested"))
+        os.makedirs(os.path.join(root, "docs"))
+        for path in PATHS:
+            open(os.path.join(root, path), "a").close()
+
+        paths = [os.path.join(root, path) for path in PATHS]
+        cached = Workspace(root)
+        uncached = Workspace(root, cache_size=0)
+
+        print(f"Path resolution ({ITERATIONS:,} calls, best of 5)")
+        print("-" * 50)
+        measure("Unconfined (expanduser)", os.path.expanduser, paths)
+        measure("Workspace, uncached", uncached.resolve, PATHS)
+        measure("Workspace, cached", cached.resolve, PATHS)
+        measure("Workspace, cached + walk", lambda path: walk(cached, path), PATHS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+
+# adk loads its configuration at import time and requires an API key.
+# Tests never reach the real API, so a placeholder is enough.
+os.environ.setdefault("GEMINI_API_KEY", "test-api-key")
@@ -0,0 +1,185 @@
+import gc
+from types import SimpleNamespace
+
+from google.genai import types
+
+from adk import Agent, History, PayloadStore
+from adk.history import Payload
+
+LARGE_RESPONSE = {
+    "function_response": {"name": "read_file", "response": {"result": "x" * 1000}}
+}
+
+
+class TestHistory:
+    """Tests for the History class."""
+
+    def test_text_parts_are_stored_as_strings(self):
+        """Test that plain text parts are kept as str."""
+        history = History()
+
+        history.append("user", [{"text": "Hello"}])
+        history.append_content(
+            types.Content(role="model", parts=[types.Part(text="Hi there")])
+        )
+
+        assert [turn.parts for turn in history] == [("Hello",), ("Hi there",)]
+
+    def test_round_trip_to_contents(self):
+        """Test that every part survives conversion back to SDK types."""
+        history = History()
+        model_content = types.Content(
+            role="model",
+            parts=[
+                types.Part(text="Let me look."),
+                types.Part(
+                    function_call=types.FunctionCall(
+                        name="list_dir", args={"directory_path": "."}
+                    ),
+                    thought_signature=b"\x00\xffsignature",
+                ),
+            ],
+        )
+
+        history.append("user", [{"text": "What files are here?"}])
+        history.append_content(model_content)
+        history.append("user", [LARGE_RESPONSE])
+
+        contents = history.to_contents()
+
+        assert contents[0] == types.Content(
+            role="user", parts=[types.Part(text="What files are here?")]
+        )
+        assert contents[1] == model_content
+        assert contents[2] == types.Content(
+            role="user", parts=[types.Part.model_validate(LARGE_RESPONSE)]
+        )
+
+    def test_pop_removes_last_turn(self):
+        """Test that pop removes the most recent turn."""
+        history = History()
+        history.append("user", [{"text": "Hello"}])
+
+        turn = history.pop()
+
+        assert turn.role == "user"
+        assert len(history) == 0
+
+    def test_turns_use_slots(self):
+        """Test that turns do not carry a per-instance __dict__."""
+        history = History()
+        history.append("user", [{"text": "Hello"}])
+
+        assert not hasattr(next(iter(history)), "__dict__")
+
+    def test_large_payloads_are_shared_across_sessions(self):
+        """Test that identical large payloads are stored once."""
+        store = PayloadStore()
+        first = History(payload_store=store)
+        second = History(payload_store=store)
+
+        first.append("user", [LARGE_RESPONSE])
+        second.append("user", [LARGE_RESPONSE])
+
+        first_part = next(iter(first)).parts[0]
+        second_part = next(iter(second)).parts[0]
+        assert isinstance(first_part, Payload)
+        assert first_part is second_part
+        assert len(store) == 1
+
+    def test_small_payloads_are_not_interned(self):
+        """Test that payloads below min_size are kept inline as bytes."""
+        history = History(payload_store=PayloadStore(min_size=256))
+
+        history.append("user", [{"function_response": {"name": "f", "response": {}}}])
+
+        assert isinstance(next(iter(history)).parts[0], bytes)
+
+    def test_unreferenced_payloads_are_released(self):
+        """Test that the store drops payloads no history references."""
+        store = PayloadStore()
+        history = History(payload_store=store)
+        history.append("user", [LARGE_RESPONSE])
+
+        history.pop()
+        gc.collect()
+
+        assert len(store) == 0
+
+    def test_digest_collision_keeps_payloads_apart(self, monkeypatch):
+        """Test that data colliding on digest never receives another payload."""
+        digest = SimpleNamespace(digest=lambda: b"0" * 16)
+        monkeypatch.setattr(
+            "adk.history.hashlib.blake2b", lambda data, digest_size: digest
+        )
+        store = PayloadStore(min_size=1)
+
+        first = store.intern(b"first")
+        second = store.intern(b"second")
+
+        assert first.data == b"first"
+        assert second.data == b"second"
+        assert store.intern(b"first") is first
+
+    def test_memory_usage_counts_shared_payload_once(self):
+        """Test that a payload repeated within a session is counted once."""
+        history = History(payload_store=PayloadStore())
+        history.append("user", [LARGE_RESPONSE])
+        once = history.memory_usage()
+
+        history.append("user", [LARGE_RESPONSE])
+        twice = history.memory_usage()
+
+        assert once > 1000
+        assert twice - once < 1000
+
+
+class TestAgentHistory:
+    """Tests for the Agent's use of History."""
+
+    def test_agent_contents_are_built_from_history(self):
+        """Test that Agent.contents reflects the compact history."""
+        agent = Agent(model="gemini-2.5-flash")
+        agent.history.append("user", [{"text": "Hello"}])
+
+        assert agent.contents == [
+            types.Content(role="user", parts=[types.Part(text="Hello")])
+        ]
+
+    def test_contents_setter_replaces_history(self):
+        """Test that assigning contents rebuilds the history."""
+        agent = Agent(model="gemini-2.5-flash")
+        agent.history.append("user", [{"text": "Old"}])
+
+        agent.contents = [
+            {"role": "user", "parts": [{"text": "Hello"}]},
+            types.Content(role="model", parts=[types.Part(text="Hi")]),
+        ]
+
+        assert [turn.parts for turn in agent.history] == [("Hello",), ("Hi",)]
+        agent.contents = []
+        assert len(agent.history) == 0
+
+    def test_run_without_candidate_content(self):
+        """Test that a response without content leaves no dangling user turn."""
+        response = types.GenerateContentResponse(
+            candidates=[types.Candidate(finish_reason=types.FinishReason.SAFETY)]
+        )
+        agent = Agent(model="gemini-2.5-flash")
+        agent.client = SimpleNamespace(
+            models=SimpleNamespace(generate_content=lambda **kwargs: response)
+        )
+
+        assert agent.run("Hello") is response
+        assert len(agent.history) == 0
+
+    def test_run_without_candidates(self):
+        """Test that a response without candidates is returned as-is."""
+        response = types.GenerateContentResponse(candidates=[])
+        agent = Agent(model="gemini-2.5-flash")
+        agent.client = SimpleNamespace(
+            models=SimpleNamespace(generate_content=lambda **kwargs: response)
+        )
+
+        assert agent.run("Hello") is response
+        assert len(agent.history) == 0
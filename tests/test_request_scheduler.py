@@ -0,0 +1,526 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from google import genai
+from google.genai import errors, types
+
+from adk import (
+    Agent,
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    RequestScheduler,
+    RetryPolicy,
+)
+
+
+class FaultInjectingServer:
+    """Local stand-in for the Gemini API that replays scripted faults.
+
+    Each request consumes the next (status, delay) or (status, delay, body)
+    entry from the script. Once the script is exhausted, requests succeed
+    immediately with a text reply.
+    """
+
+    def __init__(self):
+        self.script = []
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _next_fault(self):
+        with self._lock:
+            self.requests += 1
+            return self.script.pop(0) if self.script else (200, 0)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status, delay, *body = server._next_fault()
+                time.sleep(delay)
+                if body:
+                    body = body[0]
+                elif status == 200:
+                    body = model_reply({"text": "ok"})
+                else:
+                    body = {"error": {"code": status, "message": "injected fault"}}
+                payload = json.dumps(body).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up on this request at its deadline
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+@pytest.fixture
+def stub_server():
+    server = FaultInjectingServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def make_agent(stub_server):
+    def factory(scheduler, tools=None):
+        agent = Agent(model="gemini-2.5-flash", tools=tools, scheduler=scheduler)
+        agent.client = genai.Client(
+            api_key="test-api-key",
+            http_options=types.HttpOptions(base_url=stub_server.url),
+        )
+        return agent
+
+    return factory
+
+
+def model_reply(*parts):
+    return {"candidates": [{"content": {"role": "model", "parts": list(parts)}}]}
+
+
+FUNCTION_CALL = model_reply(
+    {"functionCall": {"name": "save_note", "args": {"note": "hello"}}}
+)
+
+
+class NoteTool:
+    """A tool that records every run, optionally taking a while."""
+
+    def __init__(self, delay=0):
+        self.notes = []
+        self.delay = delay
+
+    def as_function(self):
+        def save_note(note: str) -> bool:
+            """Saves a note.
+
+            Args:
+                note: The note to save.
+            """
+            time.sleep(self.delay)
+            self.notes.append(note)
+            return True
+
+        return save_note
+
+
+def no_backoff_policy(max_attempts=3):
+    return RetryPolicy(max_attempts=max_attempts, initial_backoff=0, max_backoff=0)
+
+
+class TestRetryPolicy:
+    """Tests for the RetryPolicy class."""
+
+    def test_backoff_is_bounded_and_grows(self):
+        """Test that backoff stays within the exponential bound."""
+        policy = RetryPolicy(initial_backoff=1.0, max_backoff=3.0, multiplier=2.0)
+
+        for _ in range(100):
+            assert 0 <= policy.backoff(0) <= 1.0
+            assert 0 <= policy.backoff(1) <= 2.0
+            assert 0 <= policy.backoff(5) <= 3.0
+
+    def test_retryable_errors(self):
+        """Test that transient errors are classified as retryable."""
+        policy = RetryPolicy()
+
+        assert policy.is_retryable(errors.ServerError(503, {}))
+        assert policy.is_retryable(errors.ClientError(429, {}))
+        assert policy.is_retryable(ConnectionError())
+        assert not policy.is_retryable(errors.ClientError(400, {}))
+        assert not policy.is_retryable(DeadlineExceededError())
+        assert not policy.is_retryable(ValueError())
+
+    def test_invalid_max_attempts(self):
+        """Test that at least one attempt is required."""
+        with pytest.raises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+
+class TestCircuitBreaker:
+    """Tests for the CircuitBreaker class."""
+
+    def test_opens_after_threshold(self):
+        """Test that consecutive failures open the circuit."""
+        breaker = CircuitBreaker(failure_threshold=2)
+
+        breaker.record_failure()
+        breaker.before_request()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+    def test_half_open_probe(self):
+        """Test that a single probe is allowed after the reset timeout."""
+        now = [0.0]
+        breaker = CircuitBreaker(
+            failure_threshold=1, reset_timeout=10, clock=lambda: now[0]
+        )
+        breaker.record_failure()
+
+        now[0] = 10.0
+        breaker.before_request()
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_release_frees_the_probe_slot(self):
+        """Test that releasing a probe lets another one through."""
+        now = [0.0]
+        breaker = CircuitBreaker(
+            failure_threshold=1, reset_timeout=10, clock=lambda: now[0]
+        )
+        breaker.record_failure()
+        now[0] = 10.0
+        breaker.before_request()
+
+        breaker.release()
+        breaker.before_request()
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    def test_failed_probe_reopens(self):
+        """Test that a failed probe opens the circuit again."""
+        now = [0.0]
+        breaker = CircuitBreaker(
+            failure_threshold=3, reset_timeout=10, clock=lambda: now[0]
+        )
+        for _ in range(3):
+            breaker.record_failure()
+
+        now[0] = 10.0
+        breaker.before_request()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+
+class TestRequestScheduler:
+    """Tests for the RequestScheduler class."""
+
+    def test_returns_result(self):
+        """Test that a successful request is returned as-is."""
+        scheduler = RequestScheduler()
+
+        assert scheduler.execute(lambda timeout: 42) == 42
+
+    def test_non_retryable_error_is_raised_immediately(self):
+        """Test that permanent errors are not retried."""
+        calls = []
+
+        def request(timeout):
+            calls.append(1)
+            raise ValueError("bad request")
+
+        with pytest.raises(ValueError):
+            RequestScheduler().execute(request)
+        assert len(calls) == 1
+
+    def test_request_receives_remaining_time(self):
+        """Test that every request receives its time budget."""
+        scheduler = RequestScheduler()
+
+        assert scheduler.execute(lambda timeout: timeout) is None
+        assert 0 < scheduler.execute(lambda timeout: timeout, deadline=1.0) <= 1.0
+
+    def test_optional_parameters_receive_the_timeout(self):
+        """Test that the timeout is passed even to parameters with defaults."""
+        received = []
+
+        def request(timeout="unset"):
+            received.append(timeout)
+
+        RequestScheduler().execute(request)
+
+        assert received == [None]
+
+    def test_hedge_delay_uses_percentile(self):
+        """Test that the hedge delay follows observed latencies."""
+        scheduler = RequestScheduler(
+            hedge_delay=5.0, min_hedge_samples=20, attempt_timeout=10.0
+        )
+        assert scheduler.current_hedge_delay() == 5.0
+
+        scheduler._latencies.extend(i / 100 for i in range(1, 101))
+
+        assert scheduler.current_hedge_delay() == pytest.approx(0.95)
+
+    def test_hedging_requires_a_bound(self):
+        """Test that hedging without a deadline or attempt timeout is refused."""
+        with pytest.raises(ValueError):
+            RequestScheduler(hedge_delay=1.0)
+
+    def test_attempt_timeout_caps_the_budget(self):
+        """Test that attempts receive the shorter of both time limits."""
+        scheduler = RequestScheduler(attempt_timeout=0.5)
+
+        assert scheduler.execute(lambda timeout: timeout) == 0.5
+        assert scheduler.execute(lambda timeout: timeout, deadline=0.2) <= 0.2
+
+    def test_half_open_breaker_sends_a_single_probe(self):
+        """Test that a hedge is not sent while the half-open probe is running."""
+        now = [0.0]
+        breaker = CircuitBreaker(
+            failure_threshold=1, reset_timeout=10, clock=lambda: now[0]
+        )
+        breaker.record_failure()
+        now[0] = 10.0
+        calls = []
+
+        def request(timeout):
+            calls.append(timeout)
+            time.sleep(0.2)
+            return "ok"
+
+        scheduler = RequestScheduler(
+            hedge_delay=0.05, attempt_timeout=1.0, circuit_breaker=breaker
+        )
+
+        assert scheduler.execute(request) == "ok"
+        assert len(calls) == 1
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_queue_expiry_is_not_a_backend_failure(self):
+        """Test that attempts expiring before reaching a worker are not recorded."""
+        breaker = CircuitBreaker(failure_threshold=1)
+        scheduler = RequestScheduler(max_workers=1, circuit_breaker=breaker)
+        blocker = threading.Event()
+        scheduler._get_executor().submit(blocker.wait)
+
+        try:
+            with pytest.raises(DeadlineExceededError):
+                scheduler.execute(lambda timeout: "ok", deadline=0.1)
+        finally:
+            blocker.set()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert scheduler.execute(lambda timeout: "ok", deadline=1.0) == "ok"
+
+    def test_hedging_disabled_by_default(self):
+        """Test that no hedge delay is reported when hedging is disabled."""
+        assert RequestScheduler().current_hedge_delay() is None
+
+
+class TestRequestSchedulerWithStubServer:
+    """Tests running Agent turns against a fault-injecting stub server."""
+
+    def test_retries_transient_errors(self, stub_server, make_agent):
+        """Test that 503 and 429 responses are retried until success."""
+        stub_server.script = [(503, 0), (429, 0)]
+        agent = make_agent(RequestScheduler(retry_policy=no_backoff_policy()))
+
+        response = agent.run("Hello")
+
+        assert response.text == "ok"
+        assert stub_server.requests == 3
+        assert len(agent.contents) == 2
+
+    def test_gives_up_after_max_attempts(self, stub_server, make_agent):
+        """Test that the last error is raised once retries are exhausted."""
+        stub_server.script = [(500, 0)] * 3
+        agent = make_agent(RequestScheduler(retry_policy=no_backoff_policy()))
+
+        with pytest.raises(errors.ServerError):
+            agent.run("Hello")
+
+        assert stub_server.requests == 3
+        assert agent.contents == []
+
+    def test_client_errors_are_not_retried(self, stub_server, make_agent):
+        """Test that 400 responses fail without retrying."""
+        stub_server.script = [(400, 0)]
+        agent = make_agent(RequestScheduler(retry_policy=no_backoff_policy()))
+
+        with pytest.raises(errors.ClientError):
+            agent.run("Hello")
+
+        assert stub_server.requests == 1
+
+    def test_deadline_exceeded(self, stub_server, make_agent):
+        """Test that a slow response fails the turn at its deadline."""
+        stub_server.script = [(200, 1.0)]
+        agent = make_agent(RequestScheduler(deadline=0.2))
+
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceededError):
+            agent.run("Hello")
+
+        assert time.monotonic() - started < 0.9
+        assert agent.contents == []
+
+    def test_deadline_failures_do_not_starve_workers(self, stub_server, make_agent):
+        """Test that calls past their deadline are aborted, freeing workers."""
+        stub_server.script = [(200, 2.0)] * 6
+        agent = make_agent(
+            RequestScheduler(
+                retry_policy=no_backoff_policy(max_attempts=1),
+                deadline=0.2,
+                max_workers=2,
+            )
+        )
+
+        for _ in range(6):
+            with pytest.raises(DeadlineExceededError):
+                agent.run("Hello")
+        agent.scheduler.deadline = 1.0
+        response = agent.run("Hello again")
+
+        assert response.text == "ok"
+
+    def test_hedge_losers_do_not_starve_workers(self, stub_server, make_agent):
+        """Test that stalled hedged attempts are aborted without a deadline."""
+        stub_server.script = [(200, 2.0)] * 8
+        agent = make_agent(
+            RequestScheduler(
+                retry_policy=no_backoff_policy(max_attempts=1),
+                hedge_delay=0.05,
+                attempt_timeout=0.3,
+                max_workers=2,
+            )
+        )
+
+        for _ in range(4):
+            with pytest.raises(httpx.TimeoutException):
+                agent.run("Hello")
+        started = time.monotonic()
+        response = agent.run("Hello again")
+
+        assert response.text == "ok"
+        assert time.monotonic() - started < 1.0
+
+    def test_hedged_request_wins(self, stub_server, make_agent):
+        """Test that a hedge returns before a stalled original request."""
+        stub_server.script = [(200, 1.0)]
+        agent = make_agent(RequestScheduler(hedge_delay=0.1, attempt_timeout=2.0))
+
+        started = time.monotonic()
+        response = agent.run("Hello")
+
+        assert response.text == "ok"
+        assert time.monotonic() - started < 0.9
+        assert stub_server.requests == 2
+
+    def test_circuit_breaker_rejects_after_failures(self, stub_server, make_agent):
+        """Test that the breaker stops calling a failing backend."""
+        stub_server.script = [(503, 0)] * 2
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        agent = make_agent(
+            RequestScheduler(retry_policy=no_backoff_policy(), circuit_breaker=breaker)
+        )
+
+        with pytest.raises(CircuitOpenError):
+            agent.run("Hello")
+
+        assert stub_server.requests == 2
+        with pytest.raises(CircuitOpenError):
+            agent.run("Hello again")
+        assert stub_server.requests == 2
+
+
+class TestToolCallsWithStubServer:
+    """Tests that tools run exactly once however model requests are scheduled."""
+
+    def test_tool_runs_once_when_follow_up_is_retried(self, stub_server, make_agent):
+        """Test that retrying the follow-up request does not rerun the tool."""
+        stub_server.script = [(200, 0, FUNCTION_CALL), (503, 0)]
+        tool = NoteTool()
+        agent = make_agent(
+            RequestScheduler(retry_policy=no_backoff_policy()),
+            tools=[tool.as_function()],
+        )
+
+        response = agent.run("Save a note")
+
+        assert response.text == "ok"
+        assert tool.notes == ["hello"]
+        assert stub_server.requests == 3
+        assert [content.role for content in agent.contents] == [
+            "user",
+            "model",
+            "user",
+            "model",
+        ]
+
+    def test_tool_runs_once_when_request_is_hedged(self, stub_server, make_agent):
+        """Test that a hedged duplicate does not run the tool a second time."""
+        stub_server.script = [(200, 0.5, FUNCTION_CALL), (200, 0, FUNCTION_CALL)]
+        tool = NoteTool()
+        agent = make_agent(
+            RequestScheduler(hedge_delay=0.1, attempt_timeout=2.0),
+            tools=[tool.as_function()],
+        )
+
+        response = agent.run("Save a note")
+        time.sleep(0.5)  # Let the losing original return
+
+        assert response.text == "ok"
+        assert tool.notes == ["hello"]
+
+    def test_tool_runs_once_at_the_deadline(self, stub_server, make_agent):
+        """Test that nothing runs or is sent after a turn hits its deadline."""
+        stub_server.script = [(200, 0, FUNCTION_CALL)]
+        tool = NoteTool(delay=0.5)
+        agent = make_agent(RequestScheduler(deadline=0.3), tools=[tool.as_function()])
+
+        with pytest.raises(DeadlineExceededError):
+            agent.run("Save a note")
+        time.sleep(0.5)
+
+        assert tool.notes == ["hello"]
+        assert stub_server.requests == 1
+        assert agent.contents == []
+
+    def test_tool_errors_are_reported_to_the_model(self, stub_server, make_agent):
+        """Test that a failing tool becomes an error function response."""
+        stub_server.script = [(200, 0, FUNCTION_CALL)]
+
+        def save_note(note: str) -> bool:
+            """Saves a note.
+
+            Args:
+                note: The note to save.
+            """
+            raise OSError("disk full")
+
+        agent = make_agent(RequestScheduler(), tools=[save_note])
+
+        agent.run("Save a note")
+
+        function_response = agent.contents[2].parts[0].function_response
+        assert function_response.response == {"error": "disk full"}
@@ -0,0 +1,214 @@
+import errno
+import inspect
+import os
+
+import pytest
+
+from agents import FileAgent
+from tools import Workspace, bind_file_tools, file_tools
+
+
+@pytest.fixture
+def workspace_root(tmp_path):
+    root = tmp_path / "workspace"
+    root.mkdir()
+    return root
+
+
+class TestWorkspace:
+    """Tests for the Workspace class."""
+
+    def test_requires_a_root(self):
+        """Test that a workspace cannot be created without roots."""
+        with pytest.raises(ValueError):
+            Workspace()
+
+    def test_root_must_be_a_directory(self, tmp_path):
+        """Test that a missing root directory is rejected."""
+        with pytest.raises(NotADirectoryError):
+            Workspace(tmp_path / "missing")
+
+    def test_resolve_relative_path(self, workspace_root):
+        """Test that relative paths resolve against the first root."""
+        workspace = Workspace(workspace_root)
+
+        assert workspace.resolve("notes.txt") == str(workspace_root / "notes.txt")
+        assert workspace.resolve(".") == str(workspace_root)
+
+    def test_resolve_rejects_parent_escape(self, workspace_root):
+        """Test that '..' cannot leave the workspace."""
+        workspace = Workspace(workspace_root)
+
+        with pytest.raises(PermissionError):
+            workspace.resolve("../outside.txt")
+
+    def test_resolve_rejects_absolute_path_outside(self, workspace_root, tmp_path):
+        """Test that absolute paths outside every root are rejected."""
+        workspace = Workspace(workspace_root)
+
+        with pytest.raises(PermissionError):
+            workspace.resolve(str(tmp_path / "outside.txt"))
+
+    def test_resolve_rejects_sibling_with_common_prefix(self, tmp_path):
+        """Test that a sibling directory sharing the root's prefix is rejected."""
+        (tmp_path / "work").mkdir()
+        (tmp_path / "workshop").mkdir()
+        workspace = Workspace(tmp_path / "work")
+
+        with pytest.raises(PermissionError):
+            workspace.resolve(str(tmp_path / "workshop" / "file.txt"))
+
+    def test_open_rejects_symlink_escape(self, workspace_root, tmp_path):
+        """Test that a symlink pointing outside the workspace is rejected."""
+        (tmp_path / "secret.txt").write_text("secret")
+        (workspace_root / "link.txt").symlink_to(tmp_path / "secret.txt")
+        workspace = Workspace(workspace_root)
+
+        with pytest.raises(PermissionError):
+            workspace.open("link.txt")
+
+    def test_open_follows_symlink_inside(self, workspace_root):
+        """Test that symlinks to files and directories inside are followed."""
+        (workspace_root / "dir").mkdir()
+        (workspace_root / "dir" / "target.txt").write_text("content")
+        (workspace_root / "link.txt").symlink_to("dir/target.txt")
+        (workspace_root / "dirlink").symlink_to(workspace_root / "dir")
+        workspace = Workspace(workspace_root)
+
+        assert workspace.open("link.txt").read() == "content"
+        assert workspace.open("dirlink/target.txt").read() == "content"
+        assert workspace.listdir("dirlink") == ["target.txt"]
+
+    def test_open_rejects_symlink_loop(self, workspace_root):
+        """Test that symlink loops fail instead of recursing forever."""
+        (workspace_root / "a").symlink_to("b")
+        (workspace_root / "b").symlink_to("a")
+        workspace = Workspace(workspace_root)
+
+        with pytest.raises(OSError) as error:
+            workspace.open("a")
+        assert error.value.errno == errno.ELOOP
+
+    def test_multiple_roots(self, workspace_root, tmp_path):
+        """Test that absolute paths inside any root are accepted."""
+        shared = tmp_path / "shared"
+        shared.mkdir()
+        (shared / "doc.txt").write_text("shared")
+        workspace = Workspace(workspace_root, shared)
+
+        assert workspace.resolve(str(shared / "doc.txt")) == str(shared / "doc.txt")
+        assert workspace.open(str(shared / "doc.txt")).read() == "shared"
+
+    def test_resolve_is_cached(self, workspace_root, monkeypatch):
+        """Test that repeated resolutions skip normalization."""
+        workspace = Workspace(workspace_root)
+        workspace.resolve("notes.txt")
+
+        def fail(path):
+            raise AssertionError("normpath should not be called")
+
+        monkeypatch.setattr(os.path, "normpath", fail)
+
+        assert workspace.resolve("notes.txt") == str(workspace_root / "notes.txt")
+
+    def test_cache_is_bounded(self, workspace_root):
+        """Test that the cache evicts the least recently used paths."""
+        workspace = Workspace(workspace_root, cache_size=2)
+
+        for name in ["a", "b", "c"]:
+            workspace.resolve(name)
+
+        assert list(workspace._cache) == ["b", "c"]
+
+    def test_open_rejects_file_swapped_for_symlink_after_caching(
+        self, workspace_root, tmp_path
+    ):
+        """Test that a symlink created at a cached path is checked again."""
+        (tmp_path / "secret.txt").write_text("secret")
+        workspace = Workspace(workspace_root)
+        workspace.resolve("file.txt")
+        (workspace_root / "file.txt").symlink_to(tmp_path / "secret.txt")
+
+        with pytest.raises(PermissionError):
+            workspace.open("file.txt", "r")
+
+    def test_open_rejects_directory_swapped_for_symlink_after_caching(
+        self, workspace_root, tmp_path
+    ):
+        """Test that an intermediate directory replaced by a symlink is checked."""
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (outside / "f.txt").write_text("secret")
+        (workspace_root / "sub").mkdir()
+        (workspace_root / "sub" / "f.txt").write_text("inside")
+        workspace = Workspace(workspace_root)
+        assert workspace.open("sub/f.txt").read() == "inside"
+
+        (workspace_root / "sub" / "f.txt").unlink()
+        (workspace_root / "sub").rmdir()
+        (workspace_root / "sub").symlink_to(outside)
+
+        with pytest.raises(PermissionError):
+            workspace.open("sub/f.txt")
+        with pytest.raises(PermissionError):
+            workspace.open("sub/f.txt", "w")
+        with pytest.raises(PermissionError):
+            workspace.listdir("sub")
+        assert (outside / "f.txt").read_text() == "secret"
+
+
+class TestBindFileTools:
+    """Tests for the bind_file_tools function."""
+
+    def test_tools_keep_names(self, workspace_root):
+        """Test that bound tools expose the same names as the module-level ones."""
+        tools = bind_file_tools(Workspace(workspace_root))
+
+        assert [tool.__name__ for tool in tools] == [
+            "read_file",
+            "write_file",
+            "list_dir",
+        ]
+
+    def test_tools_keep_declarations(self, workspace_root):
+        """Test that bound tools have the same signatures and docstrings as the module-level ones."""
+        tools = bind_file_tools(Workspace(workspace_root))
+
+        for bound, tool in zip(tools, file_tools):
+            assert inspect.signature(bound) == inspect.signature(tool)
+            assert inspect.getdoc(bound) == inspect.getdoc(tool)
+
+    def test_tools_access_workspace(self, workspace_root):
+        """Test that bound tools read, write and list inside the workspace."""
+        read_file, write_file, list_dir = bind_file_tools(Workspace(workspace_root))
+
+        assert write_file("hello.txt", "Hello") is True
+        assert read_file("hello.txt") == "Hello"
+        assert list_dir(".") == ["hello.txt"]
+        assert (workspace_root / "hello.txt").read_text() == "Hello"
+
+    def test_tools_reject_outside_paths(self, workspace_root):
+        """Test that bound tools refuse paths outside the workspace."""
+        read_file, write_file, list_dir = bind_file_tools(Workspace(workspace_root))
+
+        with pytest.raises(PermissionError):
+            read_file("../secret.txt")
+        with pytest.raises(PermissionError):
+            write_file("../secret.txt", "content")
+        with pytest.raises(PermissionError):
+            list_dir("/")
+
+
+class TestFileAgentWorkspace:
+    """Tests for binding a FileAgent to a Workspace."""
+
+    def test_file_agent_uses_workspace_tools(self, workspace_root):
+        """Test that a bound FileAgent uses confined tools and names its roots."""
+        workspace = Workspace(workspace_root)
+
+        agent = FileAgent(workspace=workspace)
+
+        assert agent.workspace is workspace
+        assert str(workspace_root) in agent.system_instruction
+        (workspace_root / "hello.txt").write_text("Hello")
+        assert agent.tools[0]("hello.txt") == "Hello"
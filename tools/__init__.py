@@ -1,5 +1,13 @@
 """Tools module - Reusable tools for agents."""
 
-from .file_tools import file_tools, read_file, write_file, list_dir
+from .file_tools import bind_file_tools, file_tools, read_file, write_file, list_dir
+from .workspace import Workspace
 
-__all__ = ["file_tools", "read_file", "write_file", "list_dir"]
+__all__ = [
+    "file_tools",
+    "read_file",
+    "write_file",
+    "list_dir",
+    "bind_file_tools",
+    "Workspace",
+]
@@ -1,5 +1,6 @@
 import os
 from utils import log_function_call
+from .workspace import Workspace
 
 
 @log_function_call
@@ -39,3 +40,54 @@ def list_dir(directory_path: str) -> list[str]:
 
 # List of available file tools
 file_tools = [read_file, write_file, list_dir]
+
+
+def bind_file_tools(workspace: Workspace) -> list:
+    """Returns file tools confined to the given workspace.
+
+    The bound tools have the same names and signatures as the module-level
+    ones, so the model sees identical function declarations. Paths are
+    resolved by the workspace, and any path outside its roots raises
+    PermissionError. Tell the model about the roots in the system
+    instruction, as FileAgent does.
+
+    Args:
+        workspace: The workspace the tools may access.
+
+    Examples:
+        >>> workspace = Workspace("/srv/tenants/acme")
+        >>> agent = Agent(tools=bind_file_tools(workspace))
+    """
+
+    @log_function_call
+    def read_file(file_path: str) -> str:
+        """Reads a file and returns its contents.
+
+        Args:
+            file_path: Path to the file to read.
+        """
+        with workspace.open(file_path, "r") as f:
+            return f.read()
+
+    @log_function_call
+    def write_file(file_path: str, contents: str) -> bool:
+        """Writes a file with the given contents.
+
+        Args:
+            file_path: Path to the file to write.
+            contents: Contents to write to the file.
+        """
+        with workspace.open(file_path, "w") as f:
+            f.write(contents)
+        return True
+
+    @log_function_call
+    def list_dir(directory_path: str) -> list[str]:
+        """Lists the contents of a directory.
+
+        Args:
+            directory_path: Path to the directory to list.
+        """
+        return workspace.listdir(directory_path)
+
+    return [read_file, write_file, list_dir]
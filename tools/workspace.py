@@ -0,0 +1,211 @@
+"""Workspace - Confines file tools to a set of root directories."""
+
+import errno
+import os
+import threading
+from collections import OrderedDict
+
+# Cache marker for paths that resolve outside every root
+_OUTSIDE = object()
+
+_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
+_DIRECTORY_FLAGS = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0)
+
+# Same limit as Linux's MAXSYMLINKS
+_MAX_SYMLINK_HOPS = 40
+
+
+class Workspace:
+    """A sandbox of one or more root directories for file tools.
+
+    Relative paths are resolved against the first root. Absolute paths are
+    accepted when they fall inside any root.
+
+    Resolution happens in two steps. The lexical step normalizes the path
+    and checks it against the roots; its result is kept in a bounded LRU
+    cache. The access step then walks the path one component at a time from
+    a file descriptor held on the root, opening every component with
+    O_NOFOLLOW. Symlinks met along the way are read and their targets go
+    through the lexical check again, so a link (or a directory replaced by a
+    link after its path was cached) can never lead outside the workspace.
+
+    Attributes:
+        roots: Canonical absolute paths of the root directories.
+
+    Examples:
+        >>> workspace = Workspace("/srv/tenants/acme", "/srv/shared/docs")
+        >>> workspace.resolve("notes.txt")
+        '/srv/tenants/acme/notes.txt'
+        >>> workspace.resolve("../other-tenant/secrets.txt")
+        Traceback (most recent call last):
+        ...
+        PermissionError: Path is outside the workspace: ../other-tenant/secrets.txt
+    """
+
+    def __init__(self, *roots: str | os.PathLike, cache_size: int = 4096):
+        """Initialize the workspace.
+
+        Args:
+            roots: Root directories. The first one is the default for relative paths.
+            cache_size: Maximum number of resolved paths to cache.
+
+        Raises:
+            ValueError: If no root is given.
+            NotADirectoryError: If a root is not an existing directory.
+        """
+        if not roots:
+            raise ValueError("A workspace needs at least one root directory")
+
+        self.roots = []
+        for root in roots:
+            real_root = os.path.realpath(os.path.expanduser(root))
+            if not os.path.isdir(real_root):
+                raise NotADirectoryError(f"Workspace root is not a directory: {root}")
+            self.roots.append(real_root)
+
+        self._prefixes = tuple(
+            root if root.endswith(os.sep) else root + os.sep for root in self.roots
+        )
+        self._root_fds = [os.open(root, _DIRECTORY_FLAGS) for root in self.roots]
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """Closes the file descriptors held on the roots."""
+        for fd in getattr(self, "_root_fds", []):
+            os.close(fd)
+        self._root_fds = []
+
+    def resolve(self, path: str | os.PathLike) -> str:
+        """Returns the normalized absolute path for a path inside the workspace.
+
+        This is a lexical check only: symlinks are not followed. Use `open`
+        or `listdir` to access the path safely.
+
+        Args:
+            path: Path relative to the first root, or absolute path inside a root.
+
+        Raises:
+            PermissionError: If the path lies outside every root.
+        """
+        root_index, parts = self._lookup(os.fspath(path))
+        return os.path.join(self.roots[root_index], *parts)
+
+    def invalidate(self):
+        """Clears the resolution cache."""
+        with self._lock:
+            self._cache.clear()
+
+    def open(self, path: str | os.PathLike, mode: str = "r"):
+        """Opens a file inside the workspace.
+
+        Args:
+            path: Path of the file to open.
+            mode: Either "r" to read or "w" to truncate and write.
+
+        Raises:
+            PermissionError: If the path, or a symlink along it, leads outside
+                             every root.
+            ValueError: If the mode is not supported.
+        """
+        if mode == "r":
+            flags = os.O_RDONLY
+        elif mode == "w":
+            flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+        else:
+            raise ValueError(f"Unsupported mode: {mode!r}")
+
+        return os.fdopen(self._open(os.fspath(path), flags), mode)
+
+    def listdir(self, path: str | os.PathLike = ".") -> list[str]:
+        """Lists the contents of a directory inside the workspace.
+
+        Args:
+            path: Path of the directory to list.
+
+        Raises:
+            PermissionError: If the path, or a symlink along it, leads outside
+                             every root.
+        """
+        fd = self._open(os.fspath(path), _DIRECTORY_FLAGS)
+        try:
+            return os.listdir(fd)
+        finally:
+            os.close(fd)
+
+    def _lookup(self, path: str) -> tuple[int, tuple[str, ...]]:
+        with self._lock:
+            location = self._cache.get(path)
+            if location is not None:
+                self._cache.move_to_end(path)
+
+        if location is None:
+            location = self._locate(path)
+            with self._lock:
+                self._cache[path] = location
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+
+        if location is _OUTSIDE:
+            raise PermissionError(f"Path is outside the workspace: {path}")
+        return location
+
+    def _locate(self, path: str) -> tuple[int, tuple[str, ...]] | object:
+        normalized = os.path.normpath(os.path.join(self.roots[0], path))
+        for index, root in enumerate(self.roots):
+            if normalized == root:
+                return index, ()
+            if normalized.startswith(self._prefixes[index]):
+                relative = normalized[len(self._prefixes[index]) :]
+                return index, tuple(relative.split(os.sep))
+        return _OUTSIDE
+
+    def _open(self, path: str, flags: int) -> int:
+        root_index, parts = self._lookup(path)
+        for _ in range(_MAX_SYMLINK_HOPS):
+            redirect = None
+            fd = os.dup(self._root_fds[root_index])
+            try:
+                if not parts:
+                    return os.open(".", flags | _NOFOLLOW, 0o666, dir_fd=fd)
+                for depth, name in enumerate(parts):
+                    last = depth == len(parts) - 1
+                    try:
+                        next_fd = os.open(
+                            name,
+                            (flags if last else _DIRECTORY_FLAGS) | _NOFOLLOW,
+                            0o666,
+                            dir_fd=fd,
+                        )
+                    except OSError:
+                        target = _readlink(name, fd)
+                        if target is None:
+                            raise
+                        # Check the link target against the roots like any path
+                        link_dir = os.path.join(self.roots[root_index], *parts[:depth])
+                        redirect = os.path.join(link_dir, target, *parts[depth + 1 :])
+                        break
+                    if last:
+                        return next_fd
+                    os.close(fd)
+                    fd = next_fd
+            finally:
+                os.close(fd)
+
+            location = self._locate(redirect)
+            if location is _OUTSIDE:
+                raise PermissionError(f"Path is outside the workspace: {path}")
+            root_index, parts = location
+
+        raise OSError(errno.ELOOP, "Too many levels of symbolic links", path)
+
+
+def _readlink(name: str, dir_fd: int) -> str | None:
+    try:
+        return os.readlink(name, dir_fd=dir_fd)
+    except OSError:
+        return None